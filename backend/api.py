@@ -1,13 +1,28 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, g
 from flask_cors import CORS
-import joblib
+import numpy as np
 import pandas as pd
+import atexit
+import hmac
+import math
 import os
+import re
 
-from src.schema import FEATURE_ORDER
+try:
+    import orjson
+except ImportError:  # optional, faster JSON codec for the /predict fast path
+    orjson = None
+
+# Imported before the model so XGBoost thread settings take effect
+from src.inference import InferenceExecutor, InferenceBusy, load_model
+from src.schema import INFERENCE_FEATURES
 from src.business_rules import check_business_rules
 from src.labeling import decode_gpa_class
 from src.feedback import generate_feedback
+from src.sensitivity import next_class_requirements, split_candidates
+from src.cohorts import COHORT_TAGS, CohortAggregates, parse_cohort_tags
+from src.profiling import StageTimer, clamp_interval, sample_stacks, to_collapsed, to_speedscope
+from src.static_assets import ASSETS_URL_PREFIX, StaticAssets
 
 app = Flask(
     __name__,
@@ -16,38 +31,213 @@ app = Flask(
 )
 CORS(app)
 
+# Same limit as the ASGI entry point, so both deployments answer 413 alike
+MAX_BODY_BYTES = int(os.environ.get("MAX_BODY_BYTES", str(1024 * 1024)))
+app.config["MAX_CONTENT_LENGTH"] = MAX_BODY_BYTES
+
 # Absolute path to model (Render-safe)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-MODEL_PATH = os.path.join(BASE_DIR, "models", "gpa_class_xgb_tuned.pkl")
+MODEL_PATH = os.environ.get(
+    "MODEL_PATH", os.path.join(BASE_DIR, "models", "gpa_class_xgb_tuned.pkl")
+)
+
+# Loaded once per process; with gunicorn --preload this runs in the master
+# and workers inherit the booster copy-on-write. The executor's threads all
+# predict on this one booster, so its trees are never copied per worker or
+# per thread. No prediction may run here, so neither the pool threads nor
+# OpenMP are started before fork.
+model = load_model(MODEL_PATH)
+executor = InferenceExecutor(model)
+# Values where a single feature can change the prediction, for /sensitivity
+sensitivity_candidates = split_candidates(model)
+
+# Running per-cohort counts, merged into a shared snapshot file periodically
+cohorts = CohortAggregates(
+    snapshot_path=os.environ.get(
+        "COHORT_SNAPSHOT_PATH", os.path.join(BASE_DIR, "instance", "cohorts.json")
+    ),
+    snapshot_interval=float(os.environ.get("COHORT_SNAPSHOT_INTERVAL", "60")),
+)
+atexit.register(cohorts.snapshot)
+
+# Skip pandas for payloads made only of plain JSON numbers
+FAST_PATH_ENABLED = os.environ.get("PREDICT_FAST_PATH", "1") == "1"
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+# orjson parses integer literals this long as floats
+_LONG_DIGITS = re.compile(rb"\d{20,}")
+
+# Fingerprinted, precompressed frontend held in memory. Built at deploy time
+# with python -m src.static_assets; None (serve frontend/ directly) when
+# missing or older than the current sources.
+static_assets = StaticAssets.load()
+
+# Bearer token for /admin endpoints; they are disabled when unset
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+# Request header that turns on per-request stage timing
+TRACE_HEADER = "X-Trace-Stages"
 
-model = joblib.load(MODEL_PATH)
 
-# Align inference features with dataset.py
-INFERENCE_FEATURES = [
-    f for f in FEATURE_ORDER if f != "previous_semester_gpa_scaled"
-]
+@app.before_request
+def _start_trace():
+    if request.headers.get(TRACE_HEADER) == "1":
+        g.stage_timer = StageTimer()
+
+
+@app.after_request
+def _finish_trace(response):
+    timer = g.get("stage_timer")
+    if timer is not None:
+        response.headers["Server-Timing"] = timer.server_timing()
+    return response
+
+
+def _mark(stage):
+    timer = g.get("stage_timer")
+    if timer is not None:
+        timer.mark(stage)
+
+def _serve_built_asset(url_path):
+    result = static_assets.response(
+        url_path,
+        request.headers.get("Accept-Encoding", ""),
+        request.headers.get("If-None-Match", ""),
+    )
+    if result is None:
+        return jsonify({"error": "Not found"}), 404
+    status, headers, body = result
+    return app.response_class(body, status=status, headers=headers)
+
 
 @app.route("/")
 def serve_frontend():
-    return send_from_directory(app.static_folder, "index.html")
+    if static_assets is None:
+        return send_from_directory(app.static_folder, "index.html")
+    return _serve_built_asset("/")
+
+
+@app.route(ASSETS_URL_PREFIX + "<path:filename>")
+def serve_asset(filename):
+    if static_assets is None:
+        return jsonify({"error": "Not found"}), 404
+    return _serve_built_asset(ASSETS_URL_PREFIX + filename)
+
+
+@app.errorhandler(413)
+def request_too_large(_):
+    return jsonify({"error": "Request body too large"}), 413
+
 
 @app.route("/health", methods=["GET"])
 def health_check():
     return jsonify({"status": "ok"}), 200
 
-@app.route("/predict", methods=["POST"])
-def predict():
-    data = request.get_json()
+def _request_json():
+    """
+    Parse the request body, with orjson when it is installed.
+
+    Anything orjson rejects goes through request.get_json() so errors and
+    edge cases (NaN, non-UTF-8 bodies) behave exactly as before. Bodies
+    with 20+ digit runs go there too: orjson turns integers beyond 64 bits
+    into floats, where the json module keeps exact ints.
+    """
+    if orjson is not None and request.is_json:
+        body = request.get_data(cache=True)
+        if _LONG_DIGITS.search(body) is None:
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+    return request.get_json()
+
+
+def _fast_features(data):
+    """
+    Features dict for payloads whose four features are plain ints/floats.
+
+    Mirrors the DataFrame round trip: if any value is a float, all become
+    floats, otherwise ints stay ints. Returns None for anything else, and
+    the caller falls back to the DataFrame path.
+    """
+    if not isinstance(data, dict):
+        return None
+
+    values = []
+    has_float = False
+    for f in INFERENCE_FEATURES:
+        value = data.get(f)
+        kind = type(value)
+        if kind is float:
+            has_float = True
+        elif kind is not int or not _INT64_MIN <= value <= _INT64_MAX:
+            return None
+        values.append(value)
+
+    if has_float:
+        values = [float(v) for v in values]
+    return dict(zip(INFERENCE_FEATURES, values))
+
 
+def _json_response(payload, status):
+    """
+    jsonify-identical response, serialised by orjson when available.
+
+    Only used for payloads made of ASCII strings and ints, where both
+    encoders produce the same bytes.
+    """
+    if orjson is None or app.debug:
+        return jsonify(payload), status
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE),
+        status=status,
+        mimetype="application/json",
+    )
+
+
+def _parse_student(data):
+    """
+    Validate a JSON payload into a float64 feature row and dict.
+
+    Returns (row, features_dict, rules_result, None) on success or
+    (None, None, rules_result, error_response) when the payload is rejected.
+    rules_result is None if the payload never reached the business rules.
+    """
+    features_dict = _fast_features(data) if FAST_PATH_ENABLED else None
+    if features_dict is None:
+        features_dict, error = _parse_student_frame(data)
+        if error is not None:
+            return None, None, None, error
+    _mark("validate")
+
+    rules_result = check_business_rules(features_dict)
+    _mark("business_rules")
+    if not rules_result["allowed"]:
+        return None, None, rules_result, (jsonify({
+            "error": "Business rule violation",
+            "reason": rules_result["reason"],
+            "warnings": rules_result["warnings"]
+        }), 400)
+
+    # Pipeline.predict scales in float64; a float32 row would shift the scaled values
+    row = np.array([[features_dict[f] for f in INFERENCE_FEATURES]], dtype=np.float64)
+    return row, features_dict, rules_result, None
+
+
+def _parse_student_frame(data):
+    """
+    General path: coerce any payload through a one-row DataFrame.
+
+    Returns (features_dict, None) or (None, error_response).
+    """
     if data is None:
-        return jsonify({"error": "Invalid or missing JSON payload"}), 400
+        return None, (jsonify({"error": "Invalid or missing JSON payload"}), 400)
 
     missing_features = [f for f in INFERENCE_FEATURES if f not in data]
     if missing_features:
-        return jsonify({
+        return None, (jsonify({
             "error": "Missing required features",
             "missing_features": missing_features
-        }), 400
+        }), 400)
 
     try:
         user_df = pd.DataFrame(
@@ -55,28 +245,122 @@ def predict():
             columns=INFERENCE_FEATURES
         )
     except Exception as e:
-        return jsonify({"error": str(e)}), 400
+        return None, (jsonify({"error": str(e)}), 400)
 
-    features_dict = user_df.iloc[0].to_dict()
+    return user_df.iloc[0].to_dict(), None
 
-    rules_result = check_business_rules(features_dict)
-    if not rules_result["allowed"]:
-        return jsonify({
-            "error": "Business rule violation",
-            "reason": rules_result["reason"],
-            "warnings": rules_result["warnings"]
-        }), 400
 
-    prediction_index = int(model.predict(user_df)[0])
+@app.route("/predict", methods=["POST"])
+def predict():
+    data = _request_json()
+    _mark("parse")
+    row, features_dict, rules_result, error = _parse_student(data)
+    if error is not None and rules_result is None:
+        return error
+
+    try:
+        cohort_key = parse_cohort_tags(data.get("cohort")) if isinstance(data, dict) else None
+    except ValueError as e:
+        return jsonify({"error": "Invalid cohort tags", "reason": str(e)}), 400
+
+    if error is not None:
+        # Only the attendance rule blocks a student; other rejections are bad input
+        if cohort_key is not None and "attendance" in rules_result["warning_types"]:
+            cohorts.record(cohort_key, warning_types=rules_result["warning_types"])
+        return error
+
+    try:
+        prediction_index = int(executor.predict(row)[0])
+    except InferenceBusy:
+        return jsonify({"error": "Server busy, please retry"}), 503
+    _mark("inference")
+
     prediction_label = decode_gpa_class(prediction_index)
 
     feedback = generate_feedback(prediction_label, features_dict)
+    _mark("feedback")
+
+    if cohort_key is not None:
+        cohorts.record(cohort_key, prediction_label, rules_result["warning_types"])
 
-    return jsonify({
+    return _json_response({
         "class_index": prediction_index,
         "prediction": prediction_label,
         "feedback": feedback
-    }), 200
+    }, 200)
+
+
+@app.route("/sensitivity", methods=["POST"])
+def sensitivity():
+    """
+    Smallest per-feature increase needed to reach the next GPA class.
+    """
+    _, features_dict, _, error = _parse_student(_request_json())
+    if error is not None:
+        return error
+
+    try:
+        result = next_class_requirements(executor, features_dict, candidates=sensitivity_candidates)
+    except InferenceBusy:
+        return jsonify({"error": "Server busy, please retry"}), 503
+
+    result["prediction"] = decode_gpa_class(result["class_index"])
+
+    return jsonify(result), 200
+
+
+@app.route("/cohorts", methods=["GET"])
+def cohort_summary():
+    """
+    GPA class distribution and warning rates per cohort.
+
+    Query parameters matching cohort tags (e.g. ?department=CS) filter the result.
+    """
+    filters = {tag: request.args[tag] for tag in COHORT_TAGS if tag in request.args}
+    return jsonify({"cohorts": cohorts.summary(filters)}), 200
+
+
+@app.route("/admin/profile", methods=["GET"])
+def admin_profile():
+    """
+    Sample every thread in this worker for ?seconds=N and return the profile.
+
+    ?format=collapsed (default, flamegraph.pl input) or ?format=speedscope.
+    ?interval_ms (default 5) is clamped to 1-100 ms.
+    Requires "Authorization: Bearer <ADMIN_TOKEN>".
+
+    The capture runs on this request's thread and holds it for the whole
+    duration. Under the latency profile (one thread per worker) the worker
+    serves nothing else meanwhile, so profile throughput or batch workers,
+    or keep captures short.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "Profiling is disabled"}), 404
+
+    supplied = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(supplied.encode(), f"Bearer {ADMIN_TOKEN}".encode()):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    try:
+        seconds = float(request.args.get("seconds", "10"))
+        interval = float(request.args.get("interval_ms", "5")) / 1000.0
+    except ValueError:
+        return jsonify({"error": "seconds and interval_ms must be numbers"}), 400
+    if not (math.isfinite(seconds) and math.isfinite(interval)):
+        return jsonify({"error": "seconds and interval_ms must be finite"}), 400
+
+    output_format = request.args.get("format", "collapsed")
+    if output_format not in ("collapsed", "speedscope"):
+        return jsonify({"error": "format must be 'collapsed' or 'speedscope'"}), 400
+    if seconds <= 0 or interval <= 0:
+        return jsonify({"error": "seconds and interval_ms must be positive"}), 400
+
+    interval = clamp_interval(interval)
+    samples, duration = sample_stacks(seconds, interval)
+
+    if output_format == "speedscope":
+        return jsonify(to_speedscope(samples, duration, interval)), 200
+    return app.response_class(to_collapsed(samples), status=200, mimetype="text/plain")
 
 
 # REMOVE THIS BLOCK FOR RENDER DEPLOYMENT
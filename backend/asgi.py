@@ -0,0 +1,172 @@
+"""
+ASGI entry point for the Student GPA Class Predictor API.
+
+Responsibilities:
+- Read request bodies and write responses with asyncio, so slow clients
+  hold a coroutine rather than a worker thread
+- Hand each fully received request to the Flask app on a bounded executor,
+  which keeps every response identical to the WSGI deployment
+- Shed load with 503 when the executor queue is full
+
+Usage:
+    uvicorn backend.asgi:app
+    gunicorn -k uvicorn.workers.UvicornWorker backend.asgi:app
+"""
+import asyncio
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from backend.api import MAX_BODY_BYTES, app as flask_app
+
+ASGI_THREADS = int(os.environ.get("ASGI_THREADS", "4"))
+ASGI_QUEUE_SIZE = int(os.environ.get("ASGI_QUEUE_SIZE", "64"))
+
+_BUSY_BODY = (
+    json.dumps({"error": "Server busy, please retry"}, separators=(",", ":"), sort_keys=True)
+    + "\n"
+).encode()
+_TOO_LARGE_BODY = (
+    json.dumps({"error": "Request body too large"}, separators=(",", ":"), sort_keys=True)
+    + "\n"
+).encode()
+
+
+def _wsgi_environ(scope: Dict, body: bytes) -> Dict:
+    """
+    Build a WSGI environ for a fully buffered ASGI HTTP request.
+    """
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf8").decode("latin1"),
+        "PATH_INFO": scope["path"].encode("utf8").decode("latin1"),
+        "QUERY_STRING": scope["query_string"].decode("latin1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "REMOTE_ADDR": client[0],
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode("latin1").upper().replace("-", "_")
+        value = raw_value.decode("latin1")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value
+        elif name == "CONTENT_LENGTH":
+            continue
+        else:
+            key = f"HTTP_{name}"
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+
+    return environ
+
+
+def _call_flask(environ: Dict) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    """
+    Run the Flask app to completion on an executor thread.
+    """
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response["status"] = int(status.split(" ", 1)[0])
+        response["headers"] = [
+            (name.lower().encode("latin1"), value.encode("latin1")) for name, value in headers
+        ]
+
+    result = flask_app.wsgi_app(environ, start_response)
+    try:
+        body = b"".join(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+
+    return response["status"], response["headers"], body
+
+
+class AsgiApp:
+    """
+    ASGI application serving the Flask routes with bounded CPU concurrency.
+    """
+
+    def __init__(self, threads: int = ASGI_THREADS, queue_size: int = ASGI_QUEUE_SIZE):
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="asgi")
+        self._capacity = threads + queue_size
+        # Only touched from the event loop, so no lock is needed
+        self._in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body.extend(message.get("body", b""))
+            more_body = message.get("more_body", False)
+            if len(body) > MAX_BODY_BYTES:
+                await self._send(send, 413, _TOO_LARGE_BODY)
+                return
+
+        if self._in_flight >= self._capacity:
+            await self._send(send, 503, _BUSY_BODY)
+            return
+        self._in_flight += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            status, headers, content = await loop.run_in_executor(
+                self._executor, _call_flask, _wsgi_environ(scope, bytes(body))
+            )
+        finally:
+            self._in_flight -= 1
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": content})
+
+    async def _send(self, send, status: int, content: bytes) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(content)).encode()),
+                (b"access-control-allow-origin", b"*"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": content})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+app = AsgiApp()
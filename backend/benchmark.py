@@ -0,0 +1,327 @@
+"""
+Load benchmark for the Student GPA Class Predictor API.
+
+Responsibilities:
+- Start gunicorn once per serving profile
+- Fire concurrent /predict requests at it
+- Report throughput and latency percentiles per profile
+- Compare the WSGI (gthread) and ASGI servers while many slow clients
+  hold connections open
+- Microbenchmark /predict in-process with and without the pandas-free
+  fast path, checking both give byte-identical responses
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import threading
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from backend.serving_profiles import SERVING_PROFILES
+
+SAMPLE_PAYLOAD = {
+    "average_attendance_per_course": 85,
+    "average_assignments_submission_per_course": 78.5,
+    "average_test_scores_per_course": 64,
+    "average_class_activities_and_engagements_per_course": 55,
+}
+
+
+def _post(url: str, payload: bytes) -> Tuple[float, int]:
+    """
+    POST one request; returns (seconds, HTTP status), status 0 if the connection failed.
+    """
+    request = urllib.request.Request(
+        url, data=payload, headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except (urllib.error.URLError, ConnectionError):
+        status = 0
+    return time.perf_counter() - start, status
+
+
+def wait_until_up(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/health") as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def load_test(base_url: str, requests: int, concurrency: int) -> Dict[str, float]:
+    """
+    Send `requests` POSTs to /predict from `concurrency` client threads.
+
+    Only 2xx responses count as served: req/s and percentiles cover those,
+    and everything else (503 load shedding, failed connections) is
+    reported under "errors" by status.
+    """
+    url = base_url + "/predict"
+    payload = json.dumps(SAMPLE_PAYLOAD).encode()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        results = list(clients.map(lambda _: _post(url, payload), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [seconds for seconds, status in results if 200 <= status < 300]
+    errors: Dict[str, int] = {}
+    for _, status in results:
+        if not 200 <= status < 300:
+            errors[str(status)] = errors.get(str(status), 0) + 1
+
+    return {
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3) if latencies else None,
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3) if latencies else None,
+        "errors": errors,
+    }
+
+
+@contextlib.contextmanager
+def _server(command: List[str], port: int, env: Dict[str, str]):
+    """
+    Run a server subprocess until the block exits; yields its base URL.
+    """
+    server = subprocess.Popen(
+        command,
+        cwd=BASE_DIR,
+        env=dict(os.environ, **env),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_up(base_url)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def benchmark_profile(name: str, port: int, requests: int, concurrency: int) -> Dict[str, float]:
+    """
+    Run gunicorn with one serving profile and load-test it.
+    """
+    command = [sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}", "backend.api:app"]
+    with _server(command, port, {"SERVING_PROFILE": name}) as base_url:
+        # Warm every worker before measuring
+        load_test(base_url, requests=min(requests, 200), concurrency=concurrency)
+        return load_test(base_url, requests=requests, concurrency=concurrency)
+
+
+async def _slow_client(port: int, payload: bytes, seconds: float) -> None:
+    """
+    POST /predict, dripping the body one byte at a time over `seconds`.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        (
+            "POST /predict HTTP/1.1\r\n"
+            "Host: 127.0.0.1\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+    )
+    delay = seconds / len(payload)
+    for i in range(len(payload)):
+        writer.write(payload[i:i + 1])
+        await writer.drain()
+        await asyncio.sleep(delay)
+    await reader.read()
+    writer.close()
+
+
+def _run_slow_clients(port: int, connections: int, seconds: float, stop: threading.Event) -> None:
+    payload = json.dumps(SAMPLE_PAYLOAD).encode()
+
+    async def keep_busy():
+        async def client_loop():
+            while not stop.is_set():
+                try:
+                    await _slow_client(port, payload, seconds)
+                except OSError:
+                    await asyncio.sleep(0.1)
+
+        await asyncio.gather(*(client_loop() for _ in range(connections)))
+
+    asyncio.run(keep_busy())
+
+
+# Same inference settings for both servers. gunicorn.conf.py would otherwise
+# apply its serving profile while uvicorn fell back to src.inference defaults.
+SLOW_CLIENT_ENV = {
+    "PRELOAD": "1",
+    "INFERENCE_THREADS": "1",
+    "INFERENCE_NTHREAD": "1",
+    "INFERENCE_QUEUE_SIZE": "64",
+    "OMP_NUM_THREADS": "1",
+}
+
+# Same process count for both servers so only the concurrency model differs
+SLOW_CLIENT_SERVERS = {
+    "wsgi-gthread": lambda port, workers: [
+        sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}",
+        "-w", str(workers), "--threads", "8", "backend.api:app",
+    ],
+    "asgi-uvicorn": lambda port, workers: [
+        sys.executable, "-m", "uvicorn", "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--no-access-log", "backend.asgi:app",
+    ],
+}
+
+
+def slow_client_comparison(
+    port: int,
+    workers: int,
+    slow_connections: int,
+    slow_seconds: float,
+    requests: int,
+    concurrency: int,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure fast-client throughput while `slow_connections` clients drip requests.
+    """
+    results = {}
+    for name, command in SLOW_CLIENT_SERVERS.items():
+        with _server(command(port, workers), port, SLOW_CLIENT_ENV) as base_url:
+            stop = threading.Event()
+            slow = threading.Thread(
+                target=_run_slow_clients,
+                args=(port, slow_connections, slow_seconds, stop),
+                daemon=True,
+            )
+            slow.start()
+            # Let the slow clients occupy their connections first
+            time.sleep(1.0)
+            results[name] = load_test(base_url, requests=requests, concurrency=concurrency)
+            stop.set()
+            slow.join(timeout=slow_seconds + 5)
+    return results
+
+
+# Valid and invalid payloads the fast path must answer byte-for-byte like the DataFrame path
+MICRO_PAYLOADS = [
+    SAMPLE_PAYLOAD,
+    dict(SAMPLE_PAYLOAD, average_assignments_submission_per_course=78),
+    dict(SAMPLE_PAYLOAD, average_test_scores_per_course=30.0),
+    dict(SAMPLE_PAYLOAD, average_attendance_per_course=20),
+    dict(SAMPLE_PAYLOAD, average_attendance_per_course=150),
+    dict(SAMPLE_PAYLOAD, average_attendance_per_course="85"),
+    dict(SAMPLE_PAYLOAD, average_attendance_per_course=True),
+    # Beyond 64 bits: orjson would parse this as a float
+    dict(SAMPLE_PAYLOAD, average_assignments_submission_per_course=1180591620717411303424),
+    dict(SAMPLE_PAYLOAD, average_assignments_submission_per_course=18446744073709551615),
+    {"average_attendance_per_course": 85},
+    [],
+]
+
+
+def _set_fast_path(api, enabled: bool, orjson_module) -> None:
+    api.FAST_PATH_ENABLED = enabled
+    api.orjson = orjson_module if enabled else None
+
+
+def predict_microbenchmark(iterations: int) -> Dict[str, float]:
+    """
+    Time /predict through Flask's test client with the fast path off and on.
+    """
+    from backend import api
+
+    client = api.app.test_client()
+    orjson_module = api.orjson
+
+    try:
+        for payload in MICRO_PAYLOADS:
+            body = json.dumps(payload).encode()
+            responses = []
+            for enabled in (False, True):
+                _set_fast_path(api, enabled, orjson_module)
+                # Feedback sentences are picked at random
+                random.seed(0)
+                response = client.post("/predict", data=body, content_type="application/json")
+                responses.append((response.status_code, response.get_data()))
+            if responses[0] != responses[1]:
+                raise AssertionError(f"Fast path response differs for {payload}: {responses}")
+
+        body = json.dumps(SAMPLE_PAYLOAD).encode()
+        timings = {}
+        for name, enabled in (("dataframe_us", False), ("fast_path_us", True)):
+            _set_fast_path(api, enabled, orjson_module)
+            for _ in range(min(iterations, 200)):
+                client.post("/predict", data=body, content_type="application/json")
+            start = time.perf_counter()
+            for _ in range(iterations):
+                client.post("/predict", data=body, content_type="application/json")
+            timings[name] = round((time.perf_counter() - start) / iterations * 1e6, 1)
+    finally:
+        _set_fast_path(api, True, orjson_module)
+
+    timings["saving_us"] = round(timings["dataframe_us"] - timings["fast_path_us"], 1)
+    timings["orjson"] = orjson_module is not None
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serving profiles.")
+    parser.add_argument("--profiles", nargs="*", default=list(SERVING_PROFILES))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--slow-clients", type=int, default=0,
+                        help="Compare WSGI and ASGI with this many slow connections")
+    parser.add_argument("--slow-seconds", type=float, default=5.0,
+                        help="Seconds each slow client takes to send its body")
+    parser.add_argument("--workers", type=int, default=2, help="Server processes for --slow-clients")
+    parser.add_argument("--micro", action="store_true",
+                        help="In-process /predict microbenchmark of the pandas-free fast path")
+    args = parser.parse_args()
+
+    if args.micro:
+        print(predict_microbenchmark(args.requests))
+        return
+
+    if args.slow_clients:
+        results = slow_client_comparison(
+            args.port, args.workers, args.slow_clients, args.slow_seconds,
+            args.requests, args.concurrency,
+        )
+        for name, result in results.items():
+            print(name, result)
+        return
+
+    for name in args.profiles:
+        result = benchmark_profile(name, args.port, args.requests, args.concurrency)
+        print(name, SERVING_PROFILES[name], result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Worker memory report for the Student GPA Class Predictor (Linux only).
+
+Responsibilities:
+- Find the workers of a running gunicorn master
+- Split each worker's RSS into unique (private) and shared pages
+- Optionally start gunicorn with and without --preload and compare
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from backend.benchmark import load_test, wait_until_up
+
+
+def _worker_pids(master_pid: int) -> List[int]:
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def _kb_to_mb(kb: int) -> float:
+    return round(kb / 1024, 2)
+
+
+def process_memory_mb(pid: int) -> Dict[str, float]:
+    """
+    Unique, shared and proportional memory of one process from smaps_rollup.
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+
+    return {
+        "rss_mb": _kb_to_mb(fields["Rss"]),
+        "pss_mb": _kb_to_mb(fields["Pss"]),
+        "unique_mb": _kb_to_mb(fields["Private_Clean"] + fields["Private_Dirty"]),
+        "shared_mb": _kb_to_mb(fields["Shared_Clean"] + fields["Shared_Dirty"]),
+    }
+
+
+def report(master_pid: int) -> Dict[int, Dict[str, float]]:
+    """
+    Memory breakdown for every worker of a gunicorn master.
+    """
+    return {pid: process_memory_mb(pid) for pid in _worker_pids(master_pid)}
+
+
+def _print_report(title: str, workers: Dict[int, Dict[str, float]]) -> None:
+    print(title)
+    for pid, memory in workers.items():
+        print(f"  worker {pid}: {memory}")
+    total_unique = sum(m["unique_mb"] for m in workers.values())
+    total_pss = sum(m["pss_mb"] for m in workers.values())
+    print(f"  total unique: {total_unique:.2f} MB, total PSS: {total_pss:.2f} MB")
+
+
+def compare(workers: int, port: int) -> None:
+    """
+    Start gunicorn with and without preload, warm it up and report both.
+    """
+    for preload in ("0", "1"):
+        env = dict(
+            os.environ,
+            PRELOAD=preload,
+            SERVING_PROFILE=os.environ.get("SERVING_PROFILE", "latency"),
+        )
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}",
+             "-w", str(workers), "backend.api:app"],
+            cwd=BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            wait_until_up(base_url)
+            # Touch the prediction path in every worker before measuring
+            load_test(base_url, requests=50 * workers, concurrency=workers)
+            _print_report(f"preload={preload}", report(server.pid))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report unique vs shared RSS per gunicorn worker.")
+    parser.add_argument("--pid", type=int, help="PID of a running gunicorn master")
+    parser.add_argument("--workers", type=int, default=4, help="Workers for --compare")
+    parser.add_argument("--port", type=int, default=5056)
+    parser.add_argument("--compare", action="store_true", help="Compare with and without --preload")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.workers, args.port)
+    elif args.pid:
+        _print_report(f"master {args.pid}", report(args.pid))
+    else:
+        parser.error("Pass --pid or --compare")
+
+
+if __name__ == "__main__":
+    main()
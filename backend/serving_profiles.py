@@ -0,0 +1,63 @@
+"""
+Named serving profiles for the Student GPA Class Predictor.
+
+Each profile sizes gunicorn workers/threads together with the inference
+pool and XGBoost's OpenMP threads, so that
+workers * inference_threads * nthread never oversubscribes the CPUs.
+"""
+import os
+from typing import Dict, Optional
+
+CPU_COUNT = os.cpu_count() or 1
+
+SERVING_PROFILES: Dict[str, Dict[str, int]] = {
+    # One request per worker, no queueing: lowest and most stable latency
+    "latency": {
+        "workers": CPU_COUNT,
+        "threads": 1,
+        "inference_threads": 1,
+        "nthread": 1,
+        "queue_size": 2,
+    },
+    # Many gthread connections per worker queue on one inference thread
+    "throughput": {
+        "workers": CPU_COUNT,
+        "threads": 8,
+        "inference_threads": 1,
+        "nthread": 1,
+        "queue_size": 64,
+    },
+    # Few workers, OpenMP across all cores for large /sensitivity grids
+    "batch": {
+        "workers": 1,
+        "threads": 4,
+        "inference_threads": 1,
+        "nthread": CPU_COUNT,
+        "queue_size": 16,
+    },
+}
+
+DEFAULT_PROFILE = "throughput"
+
+
+def get_profile(name: Optional[str] = None) -> Dict[str, int]:
+    """
+    Look up a profile by name, defaulting to SERVING_PROFILE or DEFAULT_PROFILE.
+    """
+    name = name or os.environ.get("SERVING_PROFILE", DEFAULT_PROFILE)
+    if name not in SERVING_PROFILES:
+        raise ValueError(
+            f"Unknown serving profile: {name}. "
+            f"Expected one of {list(SERVING_PROFILES)}"
+        )
+    return SERVING_PROFILES[name]
+
+
+def apply_profile_env(profile: Dict[str, int]) -> None:
+    """
+    Export the inference settings read by src.inference at import time.
+    """
+    os.environ.setdefault("INFERENCE_THREADS", str(profile["inference_threads"]))
+    os.environ.setdefault("INFERENCE_NTHREAD", str(profile["nthread"]))
+    os.environ.setdefault("INFERENCE_QUEUE_SIZE", str(profile["queue_size"]))
+    os.environ.setdefault("OMP_NUM_THREADS", str(profile["nthread"]))
@@ -0,0 +1,45 @@
+"""
+Gunicorn settings driven by a named serving profile.
+
+Usage:
+    SERVING_PROFILE=latency gunicorn backend.api:app
+
+Build the frontend assets as a deploy step before starting gunicorn:
+    python -m src.static_assets
+Without a build, or when frontend/ changed since it, the API serves the
+frontend sources unfingerprinted and uncompressed.
+
+The app (and model) is preloaded in the master so workers share its pages.
+Set PRELOAD=0 to load it in every worker instead.
+"""
+import gc
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.serving_profiles import get_profile, apply_profile_env
+
+_profile = get_profile()
+apply_profile_env(_profile)
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+worker_class = "gthread"
+workers = _profile["workers"]
+threads = _profile["threads"]
+
+preload_app = os.environ.get("PRELOAD", "1") == "1"
+
+
+def when_ready(server):
+    # Move everything loaded so far into the permanent generation so the
+    # workers' garbage collector never writes to (and un-shares) those pages
+    if preload_app:
+        gc.freeze()
+
+
+def worker_exit(server, worker):
+    # Persist this worker's pending cohort counts before it goes away
+    api = sys.modules.get("backend.api")
+    if api is not None:
+        api.cohorts.snapshot()
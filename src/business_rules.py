@@ -12,6 +12,9 @@ from .schema import (
     STRUCTURAL_CONTRACTS,
 )
 
+# Short names reported in "warning_types" (attendance is blocking, the rest are warnings)
+WARNING_TYPES = ("attendance", "assignments", "tests", "engagement")
+
 # Feature that is OPTIONAL and IGNORED by business rules
 OPTIONAL_IGNORED_FEATURE = "previous_semester_gpa_scaled"
 
@@ -22,6 +25,7 @@ def check_business_rules(features: Dict[str, float]) -> Dict[str, object]:
     """
 
     warnings: List[str] = []
+    warning_types: List[str] = []
 
     
     # Input validation
@@ -40,6 +44,7 @@ def check_business_rules(features: Dict[str, float]) -> Dict[str, object]:
                     "allowed": False,
                     "reason": f"Invalid type for {feature_name}. Expected numeric value.",
                     "warnings": [],
+                    "warning_types": [],
                 }
 
             if value < contract["min"] or value > contract["max"]:
@@ -51,6 +56,7 @@ def check_business_rules(features: Dict[str, float]) -> Dict[str, object]:
                         f"Received {value}."
                     ),
                     "warnings": [],
+                    "warning_types": [],
                 }
 
             continue  # do NOT enforce further rules on it
@@ -62,6 +68,7 @@ def check_business_rules(features: Dict[str, float]) -> Dict[str, object]:
                 "allowed": False,
                 "reason": f"Missing required feature: {feature_name}",
                 "warnings": [],
+                "warning_types": [],
             }
 
         value = features[feature_name]
@@ -71,6 +78,7 @@ def check_business_rules(features: Dict[str, float]) -> Dict[str, object]:
                 "allowed": False,
                 "reason": f"Invalid type for {feature_name}. Expected numeric value.",
                 "warnings": [],
+                "warning_types": [],
             }
 
         if value < contract["min"] or value > contract["max"]:
@@ -82,6 +90,7 @@ def check_business_rules(features: Dict[str, float]) -> Dict[str, object]:
                     f"Received {value}."
                 ),
                 "warnings": [],
+                "warning_types": [],
             }
 
     
@@ -97,6 +106,7 @@ def check_business_rules(features: Dict[str, float]) -> Dict[str, object]:
             "allowed": False,
             "reason": "Student attendance too low to compute GPA, advised to see the Dean with his or her parents/guardian.",
             "warnings": [],
+            "warning_types": ["attendance"],
         }
 
     # Assignments submission rule (warning only)
@@ -104,21 +114,25 @@ def check_business_rules(features: Dict[str, float]) -> Dict[str, object]:
         warnings.append(
             "Student assignments submission very low, advised to see the Dean with his or her parents/guardian."
         )
+        warning_types.append("assignments")
 
     # Test scores rule (warning only)
     if test_scores_ratio < TEST_SCORES_THRESHOLD:
         warnings.append(
             "Student test scores very low, advised to see the Dean with his or her parents/guardian."
         )
+        warning_types.append("tests")
 
     # Class activities and engagements rule (warning only)
     if class_activities_and_engagements_ratio < CLASS_ACTIVITIES_AND_ENGAGEMENTS_THRESHOLD:
         warnings.append(
             "Student class activities and engagements very low, advised to see the Dean with his or her parents/guardian."
         )
+        warning_types.append("engagement")
 
     return {
         "allowed": True,
         "reason": "",
         "warnings": warnings,
+        "warning_types": warning_types,
     }
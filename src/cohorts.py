@@ -0,0 +1,244 @@
+"""
+Cohort analytics for the Student GPA Class Predictor.
+
+Responsibilities:
+- Validate cohort tags sent with a prediction request
+- Keep running counts per cohort of predicted GPA classes and
+  business-rule warning types, updated as predictions are made
+- Periodically merge those counts into a snapshot file shared by all
+  workers so aggregates survive restarts
+- Summarise every cohort in O(number of cohorts)
+
+Snapshot I/O never fails a request: errors are logged, pending counts are
+kept for the next attempt and summaries fall back to in-memory totals.
+"""
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .business_rules import WARNING_TYPES
+from .schema import GPA_CLASS_BOUNDARY
+
+# Tags a request may use to place a student in a cohort
+COHORT_TAGS = ("department", "level")
+
+CohortKey = Tuple[Tuple[str, str], ...]
+
+CLASS_NAMES = [boundary["name"] for boundary in GPA_CLASS_BOUNDARY.values()]
+
+logger = logging.getLogger(__name__)
+
+
+def parse_cohort_tags(raw) -> Optional[CohortKey]:
+    """
+    Turn the request's "cohort" object into a hashable key.
+
+    Returns None when no cohort was sent.
+
+    Raises:
+        ValueError: If the tags are not a non-empty object of known string/int tags
+    """
+    if raw is None:
+        return None
+
+    if not isinstance(raw, dict) or not raw:
+        raise ValueError(f"cohort must be a non-empty object with tags from {list(COHORT_TAGS)}")
+
+    unknown = [tag for tag in raw if tag not in COHORT_TAGS]
+    if unknown:
+        raise ValueError(f"Unknown cohort tags: {unknown}. Expected tags from {list(COHORT_TAGS)}")
+
+    for tag, value in raw.items():
+        if isinstance(value, bool) or not isinstance(value, (str, int)):
+            raise ValueError(f"Cohort tag '{tag}' must be a string or integer")
+
+    return tuple(sorted((tag, str(value)) for tag, value in raw.items()))
+
+
+def _empty_counts() -> Dict[str, object]:
+    return {
+        "predictions": 0,
+        "blocked": 0,
+        "classes": {name: 0 for name in CLASS_NAMES},
+        "warnings": {warning_type: 0 for warning_type in WARNING_TYPES},
+    }
+
+
+def _merge(into: Dict[CohortKey, Dict], counts: Dict[CohortKey, Dict]) -> None:
+    for key, cohort in counts.items():
+        target = into.setdefault(key, _empty_counts())
+        target["predictions"] += cohort["predictions"]
+        target["blocked"] += cohort["blocked"]
+        for name, count in cohort["classes"].items():
+            target["classes"][name] = target["classes"].get(name, 0) + count
+        for warning_type, count in cohort["warnings"].items():
+            target["warnings"][warning_type] = target["warnings"].get(warning_type, 0) + count
+
+
+class CohortAggregates:
+    """
+    Running per-cohort counts for one process.
+
+    Counts since the last snapshot are held in memory. Every
+    `snapshot_interval` seconds they are added to the snapshot file under
+    an exclusive file lock, so several gunicorn workers can share one file.
+    Without a snapshot path everything stays in memory.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None, snapshot_interval: float = 60.0):
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+
+        self._lock = threading.Lock()
+        self._pending: Dict[CohortKey, Dict] = {}
+        self._disk: Dict[CohortKey, Dict] = {}
+        self._disk_stat: Optional[Tuple[int, int, int]] = None
+        self._last_snapshot = time.monotonic()
+
+    def record(
+        self,
+        key: CohortKey,
+        class_name: Optional[str] = None,
+        warning_types: Tuple[str, ...] = (),
+    ) -> None:
+        """
+        Count one student: a predicted class, or blocked when class_name is None.
+        """
+        with self._lock:
+            cohort = self._pending.setdefault(key, _empty_counts())
+            if class_name is None:
+                cohort["blocked"] += 1
+            else:
+                cohort["predictions"] += 1
+                cohort["classes"][class_name] += 1
+            for warning_type in warning_types:
+                cohort["warnings"][warning_type] += 1
+
+            if (
+                self.snapshot_path
+                and time.monotonic() - self._last_snapshot >= self.snapshot_interval
+            ):
+                self._snapshot_locked()
+
+    def snapshot(self) -> None:
+        """
+        Merge pending counts into the snapshot file now.
+        """
+        with self._lock:
+            if self.snapshot_path:
+                self._snapshot_locked()
+
+    def _read_disk(self, force: bool = False) -> Dict[CohortKey, Dict]:
+        """
+        Snapshot file contents, cached until the file is replaced.
+
+        Every snapshot is written with os.replace, so a new inode means new
+        contents even when the mtime did not tick; `force` skips the cache.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If it is not a valid snapshot
+        """
+        try:
+            stat = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return {}
+
+        file_stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if force or file_stat != self._disk_stat:
+            with open(self.snapshot_path) as f:
+                stored = json.load(f)
+            try:
+                self._disk = {
+                    tuple(sorted(entry["tags"].items())): {
+                        "predictions": entry["predictions"],
+                        "blocked": entry["blocked"],
+                        "classes": entry["classes"],
+                        "warnings": entry["warnings"],
+                    }
+                    for entry in stored["cohorts"]
+                }
+            except (KeyError, TypeError, AttributeError) as e:
+                raise ValueError(f"Malformed cohort snapshot: {e!r}") from e
+            self._disk_stat = file_stat
+        return self._disk
+
+    def _snapshot_locked(self) -> None:
+        self._last_snapshot = time.monotonic()
+        if not self._pending:
+            return
+
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_path)), exist_ok=True)
+            with open(self.snapshot_path + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+                # Always re-read under the lock: a cached copy could miss another
+                # worker's write and this replace would then drop its counts
+                totals: Dict[CohortKey, Dict] = {}
+                _merge(totals, self._read_disk(force=True))
+                _merge(totals, self._pending)
+
+                with open(tmp_path, "w") as f:
+                    json.dump(
+                        {"cohorts": [{"tags": dict(key), **cohort} for key, cohort in totals.items()]},
+                        f,
+                    )
+                os.replace(tmp_path, self.snapshot_path)
+
+                self._disk = totals
+                stat = os.stat(self.snapshot_path)
+                self._disk_stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except (OSError, ValueError):
+            # Keep the pending counts and retry after the next interval
+            logger.exception("Cohort snapshot to %s failed", self.snapshot_path)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        self._pending = {}
+
+    def summary(self, filters: Optional[Dict[str, str]] = None) -> List[Dict[str, object]]:
+        """
+        Current totals per cohort with warning rates, optionally filtered by tag values.
+
+        Totals are the snapshot file plus this process's pending counts. If
+        the file cannot be read, the last contents read or written are used.
+        """
+        filters = filters or {}
+
+        with self._lock:
+            totals: Dict[CohortKey, Dict] = {}
+            if self.snapshot_path:
+                try:
+                    disk = self._read_disk()
+                except (OSError, ValueError):
+                    logger.exception("Reading cohort snapshot %s failed", self.snapshot_path)
+                    disk = self._disk
+                _merge(totals, disk)
+            _merge(totals, self._pending)
+
+        result = []
+        for key, cohort in totals.items():
+            tags = dict(key)
+            if any(tags.get(tag) != value for tag, value in filters.items()):
+                continue
+
+            students = cohort["predictions"] + cohort["blocked"]
+            result.append({
+                "tags": tags,
+                "students": students,
+                **cohort,
+                "warning_rates": {
+                    warning_type: round(count / students, 4) if students else 0.0
+                    for warning_type, count in cohort["warnings"].items()
+                },
+            })
+        return result
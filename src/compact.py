@@ -0,0 +1,342 @@
+"""
+Model compaction for the Student GPA Class Predictor.
+
+Responsibilities:
+- Snap every split threshold to the 0-100 percent grid in float32, in
+  the scaled units the trees see when they sit behind a StandardScaler
+- Prune splits that can no longer be reached given the feature ranges
+  and the splits above them
+- Collapse splits whose two leaves carry the same value
+- Write a compact model artifact and report accuracy, memory and latency
+  before and after on the build_dataset test split
+
+Pruning assumes inputs are never missing (NaN). The API and business rules
+reject missing features, so default-direction branches are not needed.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBClassifier
+
+from .dataset import build_dataset
+from .inference import load_model
+from .schema import INFERENCE_FEATURES, STRUCTURAL_CONTRACTS
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(BASE_DIR, "models", "gpa_class_xgb_tuned.pkl")
+COMPACT_MODEL_PATH = os.path.join(BASE_DIR, "models", "gpa_class_xgb_compact.pkl")
+
+# Spacing of the percent grid thresholds are snapped to
+GRID_RESOLUTION: float = 0.01
+
+# XGBoost marks the root's parent with this value
+_ROOT_PARENT = 2147483647
+
+
+def grid_values(name: str, resolution: float = GRID_RESOLUTION) -> np.ndarray:
+    """
+    Every input a feature can take on the percent grid, in percent.
+    """
+    steps_per_unit = round(1 / resolution)
+    low = round(STRUCTURAL_CONTRACTS[name]["min"] * steps_per_unit)
+    high = round(STRUCTURAL_CONTRACTS[name]["max"] * steps_per_unit)
+    # k / steps_per_unit is the float nearest to the decimal literal, as JSON parses it
+    return np.arange(low, high + 1) / steps_per_unit
+
+
+def feature_grid(
+    name: str,
+    resolution: float = GRID_RESOLUTION,
+    mean: float = 0.0,
+    scale: float = 1.0,
+) -> np.ndarray:
+    """
+    Every input a feature can take on the percent grid, as the trees see it.
+
+    Values are scaled like StandardScaler does ((x - mean) / scale in
+    float64) and then cast to float32, which is what XGBoost compares
+    against its split thresholds.
+    """
+    return ((grid_values(name, resolution) - mean) / scale).astype(np.float32)
+
+
+def snap_index(threshold: float, grid: np.ndarray) -> int:
+    """
+    Number of grid points a split with this threshold sends left.
+
+    A split sends x left when x < threshold, so grid[:index] goes left and
+    grid[index:] goes right; the grid is sorted because scale > 0.
+    """
+    return int(np.searchsorted(grid, np.float32(threshold), side="left"))
+
+
+def _prune_node(tree: Dict, node: int, bounds: Dict[int, Tuple[int, int]], grids: Dict[int, np.ndarray]):
+    """
+    Rebuild the subtree at `node` as nested tuples.
+
+    `bounds` maps feature index -> [low, high) range of grid indices still
+    reachable here. Leaves are ("leaf", node, value); splits are
+    ("split", node, feature, threshold, left, right).
+    """
+    left = tree["left_children"][node]
+    if left == -1:
+        return ("leaf", node, float(tree["split_conditions"][node]))
+
+    right = tree["right_children"][node]
+    feature = tree["split_indices"][node]
+    index = snap_index(tree["split_conditions"][node], grids[feature])
+    low, high = bounds[feature]
+
+    # Only one side reachable: the split is redundant
+    if index <= low:
+        return _prune_node(tree, right, bounds, grids)
+    if index >= high:
+        return _prune_node(tree, left, bounds, grids)
+
+    left_node = _prune_node(tree, left, {**bounds, feature: (low, index)}, grids)
+    right_node = _prune_node(tree, right, {**bounds, feature: (index, high)}, grids)
+
+    if left_node[0] == "leaf" and right_node[0] == "leaf" and left_node[2] == right_node[2]:
+        return ("leaf", node, left_node[2])
+
+    # The first grid point that goes right: grid[index - 1] < threshold <= grid[index]
+    return ("split", node, feature, float(grids[feature][index]), left_node, right_node)
+
+
+def _flatten(tree: Dict, root) -> Dict:
+    """
+    Write a nested tree back into XGBoost's flat JSON arrays (breadth-first).
+    """
+    columns = {
+        key: [] for key in (
+            "left_children", "right_children", "parents", "split_indices",
+            "split_conditions", "default_left", "base_weights",
+            "loss_changes", "sum_hessian", "split_type",
+        )
+    }
+
+    queue = deque([(root, _ROOT_PARENT)])
+    order: List = []
+    while queue:
+        item, parent = queue.popleft()
+        index = len(order)
+        order.append((item, parent))
+        if item[0] == "split":
+            queue.append((item[4], index))
+            queue.append((item[5], index))
+
+    next_child = 1
+    for item, parent in order:
+        original = item[1]
+        columns["parents"].append(parent)
+        columns["base_weights"].append(tree["base_weights"][original])
+        columns["sum_hessian"].append(tree["sum_hessian"][original])
+        columns["split_type"].append(0)
+        columns["default_left"].append(tree["default_left"][original])
+
+        if item[0] == "leaf":
+            columns["left_children"].append(-1)
+            columns["right_children"].append(-1)
+            columns["split_indices"].append(0)
+            columns["split_conditions"].append(item[2])
+            columns["loss_changes"].append(0.0)
+        else:
+            columns["left_children"].append(next_child)
+            columns["right_children"].append(next_child + 1)
+            next_child += 2
+            columns["split_indices"].append(item[2])
+            columns["split_conditions"].append(item[3])
+            columns["loss_changes"].append(tree["loss_changes"][original])
+
+    compacted = dict(tree)
+    compacted.update(columns)
+    compacted["tree_param"] = dict(tree["tree_param"], num_nodes=str(len(order)), num_deleted="0")
+    return compacted
+
+
+def compact_model_json(
+    model_json: Dict,
+    resolution: float = GRID_RESOLUTION,
+    scaler: Optional[StandardScaler] = None,
+) -> Tuple[Dict, Dict[str, int]]:
+    """
+    Snap and prune every tree in a JSON-serialised XGBoost model.
+
+    `scaler` is the StandardScaler the trees were trained behind, if any;
+    thresholds are then in scaled units and are snapped to the scaled grid.
+    Trees with categorical splits or vector leaves are left untouched.
+
+    Returns:
+        Tuple[Dict, Dict[str, int]]: (compacted model JSON, node counts before/after)
+    """
+    learner = model_json["learner"]
+    if scaler is not None and hasattr(scaler, "feature_names_in_"):
+        feature_names = list(scaler.feature_names_in_)
+    else:
+        feature_names = learner.get("feature_names") or INFERENCE_FEATURES
+
+    grids = {}
+    for i, name in enumerate(feature_names):
+        mean = float(scaler.mean_[i]) if scaler is not None and scaler.with_mean else 0.0
+        scale = float(scaler.scale_[i]) if scaler is not None and scaler.with_std else 1.0
+        grids[i] = feature_grid(name, resolution, mean, scale)
+    # Upper bound is exclusive: every grid index is reachable at the root
+    domain = {i: (0, len(grid)) for i, grid in grids.items()}
+
+    trees = learner["gradient_booster"]["model"]["trees"]
+    nodes_before = nodes_after = 0
+
+    for i, tree in enumerate(trees):
+        nodes_before += len(tree["left_children"])
+
+        if any(tree["split_type"]) or int(tree["tree_param"].get("size_leaf_vector", "1")) > 1:
+            nodes_after += len(tree["left_children"])
+            continue
+
+        root = _prune_node(tree, 0, domain, grids)
+        trees[i] = _flatten(tree, root)
+        nodes_after += len(trees[i]["left_children"])
+
+    return model_json, {"nodes_before": nodes_before, "nodes_after": nodes_after}
+
+
+def _compact_classifier(model: XGBClassifier, scaler: Optional[StandardScaler]) -> Tuple[XGBClassifier, Dict[str, int]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "model.json")
+        model.save_model(json_path)
+        with open(json_path) as f:
+            model_json = json.load(f)
+
+        model_json, counts = compact_model_json(model_json, scaler=scaler)
+
+        with open(json_path, "w") as f:
+            json.dump(model_json, f)
+
+        compacted = XGBClassifier()
+        compacted.load_model(json_path)
+    return compacted, counts
+
+
+def compact_model(model, output_path: str = COMPACT_MODEL_PATH) -> Dict[str, int]:
+    """
+    Compact a fitted classifier, or the classifier at the end of a
+    StandardScaler pipeline, and save it.
+
+    Pipelines are written with joblib (scaler included); a bare classifier
+    is written as a native XGBoost artifact unless the path ends in .pkl.
+    """
+    if isinstance(model, Pipeline):
+        *preprocessing, (name, classifier) = model.steps
+        if len(preprocessing) > 1 or not all(isinstance(step, StandardScaler) for _, step in preprocessing):
+            raise ValueError("Only a StandardScaler -> XGBClassifier pipeline can be compacted")
+        scaler = preprocessing[0][1] if preprocessing else None
+        compacted, counts = _compact_classifier(classifier, scaler)
+        artifact = Pipeline(preprocessing + [(name, compacted)])
+    else:
+        artifact, counts = _compact_classifier(model, None)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    if output_path.endswith(".pkl"):
+        joblib.dump(artifact, output_path)
+    elif isinstance(artifact, Pipeline):
+        raise ValueError("A compacted pipeline must be saved as .pkl to keep its scaler")
+    else:
+        artifact.save_model(output_path)
+    return counts
+
+
+_RSS_PROBE = """
+import sys
+import xgboost
+from src.inference import load_model
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+before = rss_kb()
+model = load_model(sys.argv[1])
+print((rss_kb() - before) / 1024)
+"""
+
+
+def worker_rss_mb(path: str) -> float:
+    """
+    Resident memory a fresh worker process adds by loading the model (Linux only).
+    """
+    output = subprocess.check_output(
+        [sys.executable, "-c", _RSS_PROBE, path], cwd=BASE_DIR, text=True
+    )
+    return float(output.strip())
+
+
+def _per_row_latency_ms(model, X: pd.DataFrame, rows: int = 200) -> float:
+    samples = [X.iloc[[i % len(X)]] for i in range(rows)]
+    start = time.perf_counter()
+    for row in samples:
+        model.predict(row)
+    return (time.perf_counter() - start) / rows * 1000
+
+
+def _accuracy(model, X: pd.DataFrame, y: pd.Series) -> float:
+    return float(np.mean(model.predict(X) == np.asarray(y)))
+
+
+def report(original_path: str, compact_path: str, raw_df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """
+    Compare the original and compact artifacts on the build_dataset test split.
+    """
+    _, _, X_test, _, _, y_test = build_dataset(raw_df)
+    X_test = X_test[INFERENCE_FEATURES]
+
+    result = {}
+    for name, path in (("original", original_path), ("compact", compact_path)):
+        model = load_model(path)
+        result[name] = {
+            "file_kb": round(os.path.getsize(path) / 1024, 2),
+            "test_accuracy": _accuracy(model, X_test, y_test),
+            "worker_rss_mb": round(worker_rss_mb(path), 2),
+            "per_row_latency_ms": round(_per_row_latency_ms(model, X_test), 4),
+        }
+
+    result["accuracy_change"] = result["compact"]["test_accuracy"] - result["original"]["test_accuracy"]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact the GPA class XGBoost model.")
+    parser.add_argument("--model", default=MODEL_PATH, help="Source model artifact")
+    parser.add_argument("--output", default=COMPACT_MODEL_PATH, help="Compact model artifact")
+    parser.add_argument("--data", help="CSV with FEATURE_ORDER columns for the before/after report")
+    args = parser.parse_args()
+
+    counts = compact_model(load_model(args.model), args.output)
+    print("nodes_before:", counts["nodes_before"])
+    print("nodes_after:", counts["nodes_after"])
+    print("file_bytes_before:", os.path.getsize(args.model))
+    print("file_bytes_after:", os.path.getsize(args.output))
+    print("compact_model:", args.output)
+    if counts["nodes_after"] == counts["nodes_before"]:
+        # Thresholds are already float32, so snapping alone saves nothing
+        print("nothing to prune: every split separates reachable grid points with different leaves")
+
+    if args.data:
+        print(json.dumps(report(args.model, args.output, pd.read_csv(args.data)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
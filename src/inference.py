@@ -0,0 +1,156 @@
+"""
+Thread-safe inference for the Student GPA Class Predictor.
+
+Responsibilities:
+- Pin XGBoost/OpenMP thread counts before XGBoost is loaded
+- Run predictions on a bounded thread pool
+- Share one booster between all pool threads (and, with preload, workers)
+- Reject work when the pool queue is full instead of piling up requests
+- Load pickled or native (compact) model artifacts
+"""
+import os
+
+# Must be set before XGBoost (and its OpenMP runtime) is first imported
+INFERENCE_THREADS = int(os.environ.get("INFERENCE_THREADS", "1"))
+INFERENCE_NTHREAD = int(os.environ.get("INFERENCE_NTHREAD", "1"))
+INFERENCE_QUEUE_SIZE = int(os.environ.get("INFERENCE_QUEUE_SIZE", "64"))
+os.environ.setdefault("OMP_NUM_THREADS", str(INFERENCE_NTHREAD))
+
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import joblib
+import numpy as np
+
+
+def load_model(path: str):
+    """
+    Load either a pickled classifier or a native XGBoost artifact (.json/.ubj).
+    """
+    if path.endswith(".pkl"):
+        return joblib.load(path)
+
+    from xgboost import XGBClassifier
+
+    model = XGBClassifier()
+    model.load_model(path)
+    return model
+
+
+class InferenceBusy(RuntimeError):
+    """
+    Raised when the inference queue is full.
+    """
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool that scores rows on one shared booster.
+
+    Booster.inplace_predict is thread-safe, so pool threads share the
+    booster instead of copying it: a copy per thread would duplicate the
+    trees in every worker and undo the copy-on-write sharing of preload.
+
+    `model` is an XGBClassifier or a Pipeline ending in one. Rows are
+    arrays ordered like INFERENCE_FEATURES. `predict` returns class
+    indices exactly as the model's own predict would.
+    """
+
+    def __init__(
+        self,
+        model,
+        threads: int = INFERENCE_THREADS,
+        nthread: int = INFERENCE_NTHREAD,
+        queue_size: int = INFERENCE_QUEUE_SIZE,
+    ):
+        self.model = model
+        classifier = model
+        self._scaler = None
+        self._transform = None
+        if hasattr(model, "steps"):
+            from sklearn.preprocessing import StandardScaler
+
+            classifier = model.steps[-1][1]
+            preprocessing = model[:-1]
+            if len(preprocessing) == 1 and isinstance(preprocessing[0], StandardScaler):
+                self._scaler = preprocessing[0]
+            elif len(preprocessing):
+                self._transform = preprocessing.transform
+
+        self._booster = classifier.get_booster()
+
+        # Respect early stopping the same way the sklearn wrapper does
+        try:
+            self._iteration_range = (0, int(classifier.best_iteration) + 1)
+        except AttributeError:
+            self._iteration_range = (0, 0)
+
+        config = json.loads(self._booster.save_config())
+        self._objective = config["learner"]["objective"]["name"]
+
+        self._booster.set_param({"nthread": nthread})
+        self._slots = threading.BoundedSemaphore(threads + queue_size)
+        self._pool = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="inference"
+        )
+
+    def _prepare(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Apply the pipeline's preprocessing in float64, as Pipeline.predict does.
+        """
+        if self._scaler is not None:
+            # Same arithmetic as StandardScaler.transform, without its validation overhead
+            if self._scaler.with_mean:
+                rows = rows - self._scaler.mean_
+            if self._scaler.with_std:
+                rows = rows / self._scaler.scale_
+            return rows
+        if self._transform is not None:
+            return self._transform(rows)
+        return rows
+
+    def _predict_now(self, rows: np.ndarray) -> np.ndarray:
+        rows = self._prepare(rows)
+        output = self._booster.inplace_predict(
+            rows,
+            iteration_range=self._iteration_range,
+            validate_features=False,
+        )
+        if output.ndim == 2:
+            return np.argmax(output, axis=1)
+        if self._objective.startswith("binary:"):
+            return (output > 0.5).astype(int)
+        return output.astype(int)
+
+    def submit(self, rows) -> Future:
+        """
+        Queue rows for prediction.
+
+        Raises:
+            InferenceBusy: If the pool and its queue are already full
+        """
+        # float64 so scaling matches the pipeline; XGBoost narrows to float32 itself
+        rows = np.asarray(rows, dtype=np.float64)
+        if rows.ndim == 1:
+            rows = rows[np.newaxis, :]
+
+        if not self._slots.acquire(blocking=False):
+            raise InferenceBusy("Inference queue is full")
+
+        try:
+            future = self._pool.submit(self._predict_now, rows)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def predict(self, rows) -> np.ndarray:
+        """
+        Blocking prediction; accepts a DataFrame or array of feature rows.
+        """
+        return self.submit(rows).result()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,175 @@
+"""
+Low-overhead profiling for the Student GPA Class Predictor API.
+
+Responsibilities:
+- Sample the Python stacks of every thread in this process for a fixed
+  duration and export them as collapsed stacks or a speedscope profile
+- Time the stages of a single request for Server-Timing tracing
+"""
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Upper bound on a single capture so an admin call cannot pin a thread for long
+MAX_PROFILE_SECONDS: float = 60.0
+
+# Sampling interval bounds: below 1 ms the sampler spends most of its time
+# holding the GIL walking stacks; above 100 ms a capture has too few samples
+MIN_INTERVAL: float = 0.001
+MAX_INTERVAL: float = 0.1
+
+Frame = Tuple[str, str, int]
+
+
+def _thread_names() -> Dict[int, str]:
+    return {t.ident: t.name for t in threading.enumerate()}
+
+
+def _stack(frame) -> List[Frame]:
+    """
+    Frames of one thread from outermost to innermost.
+    """
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, frame.f_lineno))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def clamp_interval(interval: float) -> float:
+    """
+    Clamp a sampling interval in seconds to [MIN_INTERVAL, MAX_INTERVAL].
+
+    Raises:
+        ValueError: If the interval is NaN or infinite
+    """
+    if not math.isfinite(interval):
+        raise ValueError("Sampling interval must be a finite number")
+    return min(max(interval, MIN_INTERVAL), MAX_INTERVAL)
+
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> Tuple[Counter, float]:
+    """
+    Sample all other threads' stacks every `interval` seconds.
+
+    Runs in the calling thread, which is busy for the whole capture.
+    `interval` is clamped with clamp_interval.
+
+    Returns:
+        Tuple[Counter, float]: Counts per (thread name, stack) and the real
+        duration of the capture in seconds
+    """
+    if not math.isfinite(seconds):
+        raise ValueError("Capture duration must be a finite number")
+    seconds = min(seconds, MAX_PROFILE_SECONDS)
+    interval = clamp_interval(interval)
+    own_ident = threading.get_ident()
+    samples: Counter = Counter()
+
+    start = time.perf_counter()
+    deadline = start + seconds
+    names = _thread_names()
+
+    while time.perf_counter() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            if ident not in names:
+                names = _thread_names()
+            samples[(names.get(ident, str(ident)), tuple(_stack(frame)))] += 1
+        time.sleep(interval)
+
+    return samples, time.perf_counter() - start
+
+
+def _frame_label(frame: Frame) -> str:
+    name, filename, line = frame
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def to_collapsed(samples: Counter) -> str:
+    """
+    Brendan Gregg collapsed-stack format, one "thread;frame;frame count" per line.
+    """
+    lines = []
+    for (thread_name, stack), count in samples.most_common():
+        frames = ";".join(_frame_label(frame) for frame in stack)
+        lines.append(f"{thread_name};{frames} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def to_speedscope(samples: Counter, duration: float, interval: float) -> Dict[str, object]:
+    """
+    speedscope "sampled" profile, one profile per thread.
+    """
+    frames: List[Dict[str, object]] = []
+    frame_index: Dict[Frame, int] = {}
+    per_thread: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+
+    for (thread_name, stack), count in samples.items():
+        indices = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            indices.append(frame_index[frame])
+
+        stacks, weights = per_thread.setdefault(thread_name, ([], []))
+        stacks.append(indices)
+        weights.append(count * interval)
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": f"gpa-predictor pid {os.getpid()}",
+        "exporter": "src.profiling",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(duration, 6),
+                "samples": stacks,
+                "weights": weights,
+            }
+            for thread_name, (stacks, weights) in per_thread.items()
+        ],
+    }
+
+
+class StageTimer:
+    """
+    Records how long each named stage of one request took.
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._last = self._start
+        self.stages: List[Tuple[str, float]] = []
+
+    def mark(self, stage: str) -> None:
+        """
+        Close the current stage: time since the previous mark (or start).
+        """
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing header value in milliseconds; "app" is untracked time.
+        """
+        total = time.perf_counter() - self._start
+        tracked = sum(duration for _, duration in self.stages)
+
+        entries = list(self.stages)
+        entries.append(("app", max(total - tracked, 0.0)))
+        entries.append(("total", total))
+        return ", ".join(f"{stage};dur={duration * 1000:.3f}" for stage, duration in entries)
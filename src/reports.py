@@ -0,0 +1,361 @@
+"""
+Bulk advisor reports for the Student GPA Class Predictor.
+
+Responsibilities:
+- Stream students from a CSV file (or stdin) in fixed-size batches
+- Score each batch with one model call and apply business rules
+- Render one report per student from precompiled templates
+- Parallelise scoring and rendering across processes
+- Write reports incrementally as CSV, one HTML page, or ZIP archives
+
+Memory stays flat with the number of students: only a bounded number of
+batches are in flight, and ZIP output rolls over to a new part every
+`zip_part_size` reports so no central directory grows without bound.
+"""
+import argparse
+import csv
+import html
+import io
+import itertools
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import zipfile
+from string import Template
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .inference import load_model
+from .business_rules import check_business_rules
+from .feedback import generate_feedback
+from .labeling import decode_gpa_class
+from .schema import INFERENCE_FEATURES
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(BASE_DIR, "models", "gpa_class_xgb_tuned.pkl")
+
+BATCH_SIZE = 1000
+ZIP_PART_SIZE = 50000
+
+# Optional input column used to name reports; falls back to the row number
+ID_COLUMN = "student_id"
+
+CSV_HEADER = [ID_COLUMN, "status", "class_index", "prediction", "warnings", "feedback", "reason"]
+
+# Precompiled templates, substituted once per student
+HTML_REPORT = Template(
+    "<section class=\"report\" id=\"student-$student_id\">\n"
+    "  <h2>Student $student_id</h2>\n"
+    "  <p><strong>Predicted GPA class:</strong> $prediction</p>\n"
+    "  <p><strong>Warnings:</strong> $warnings</p>\n"
+    "  <p>$feedback</p>\n"
+    "</section>\n"
+)
+HTML_BLOCKED = Template(
+    "<section class=\"report blocked\" id=\"student-$student_id\">\n"
+    "  <h2>Student $student_id</h2>\n"
+    "  <p><strong>Not predicted:</strong> $reason</p>\n"
+    "</section>\n"
+)
+HTML_PAGE_START = (
+    "<!doctype html>\n<html lang=\"en\">\n<head><meta charset=\"UTF-8\" />"
+    "<title>Advisor Reports</title></head>\n<body>\n"
+)
+HTML_PAGE_END = "</body>\n</html>\n"
+
+_model = None
+_init_error: Optional[str] = None
+
+
+class ReportError(RuntimeError):
+    """
+    Raised when a batch of students cannot be scored or rendered.
+    """
+
+
+def _init_worker(model_path: str) -> None:
+    global _model, _init_error
+    # An initializer that raises makes Pool respawn workers forever;
+    # keep the error and fail the first batch instead
+    try:
+        _model = load_model(model_path)
+        # One process per core already; keep XGBoost single-threaded
+        classifier = _model.steps[-1][1] if hasattr(_model, "steps") else _model
+        if "n_jobs" in classifier.get_params():
+            classifier.set_params(n_jobs=1)
+    except Exception as e:
+        _init_error = f"Could not load model {model_path}: {e!r}"
+
+
+def _parse_row(row: Dict[str, str]) -> Tuple[Optional[Dict[str, float]], str]:
+    """
+    Convert CSV strings to numbers; returns (features, "") or (None, reason).
+    """
+    features = {}
+    for f in INFERENCE_FEATURES:
+        value = (row.get(f) or "").strip()
+        if value == "":
+            return None, f"Missing required feature: {f}"
+        try:
+            features[f] = float(value)
+        except ValueError:
+            return None, f"Invalid type for {f}. Expected numeric value."
+    return features, ""
+
+
+def score_batch(rows: List[Tuple[str, Dict[str, str]]]) -> List[Dict[str, object]]:
+    """
+    Apply business rules to a batch, then predict all allowed students at once.
+    """
+    results = []
+    allowed = []
+
+    for student_id, row in rows:
+        features, reason = _parse_row(row)
+        if features is not None:
+            rules_result = check_business_rules(features)
+            reason = rules_result["reason"]
+            if rules_result["allowed"]:
+                result = {"student_id": student_id, "status": "predicted",
+                          "warnings": rules_result["warnings"], "features": features}
+                allowed.append(result)
+                results.append(result)
+                continue
+
+        results.append({"student_id": student_id, "status": "blocked", "reason": reason})
+
+    if allowed:
+        batch = pd.DataFrame([r["features"] for r in allowed], columns=INFERENCE_FEATURES)
+        for result, class_index in zip(allowed, _model.predict(batch)):
+            label = decode_gpa_class(int(class_index))
+            result["class_index"] = int(class_index)
+            result["prediction"] = label
+            result["feedback"] = generate_feedback(label, result.pop("features"))
+
+    return results
+
+
+def _render_csv(results: List[Dict[str, object]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for r in results:
+        writer.writerow([
+            r["student_id"],
+            r["status"],
+            r.get("class_index", ""),
+            r.get("prediction", ""),
+            " | ".join(r.get("warnings", [])),
+            r.get("feedback", ""),
+            r.get("reason", ""),
+        ])
+    return buffer.getvalue()
+
+
+def _render_html(result: Dict[str, object]) -> str:
+    student_id = html.escape(str(result["student_id"]))
+    if result["status"] == "blocked":
+        return HTML_BLOCKED.substitute(student_id=student_id, reason=html.escape(result["reason"]))
+    return HTML_REPORT.substitute(
+        student_id=student_id,
+        prediction=html.escape(result["prediction"]),
+        warnings=html.escape("; ".join(result["warnings"]) or "None"),
+        feedback=html.escape(result["feedback"]),
+    )
+
+
+def _process_batch(job: Tuple[str, List[Tuple[str, Dict[str, str]]]]):
+    """
+    Worker entry point: score a batch and render it in the requested format.
+
+    Returns (number of students, rendered text) for csv/html and
+    (number of students, [(name, page), ...]) for zip.
+    """
+    output_format, rows = job
+    if _init_error is not None:
+        raise ReportError(_init_error)
+    try:
+        results = score_batch(rows)
+    except Exception as e:
+        # Re-raised as a plain message so it always pickles back to the parent
+        raise ReportError(f"Batch starting at student {rows[0][0]} failed: {e!r}") from None
+
+    if output_format == "csv":
+        return len(results), _render_csv(results)
+    if output_format == "html":
+        return len(results), "".join(_render_html(r) for r in results)
+    return len(results), [
+        (str(r["student_id"]), HTML_PAGE_START + _render_html(r) + HTML_PAGE_END)
+        for r in results
+    ]
+
+
+def read_batches(stream: Iterable[str], batch_size: int) -> Iterator[List[Tuple[str, Dict[str, str]]]]:
+    """
+    Lazily yield lists of (student_id, row) from CSV text.
+    """
+    reader = csv.DictReader(stream)
+    reader.fieldnames = [name.strip() for name in reader.fieldnames or []]
+    numbered = (
+        ((row.get(ID_COLUMN) or "").strip() or str(i), row)
+        for i, row in enumerate(reader, start=1)
+    )
+    while True:
+        batch = list(itertools.islice(numbered, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _throttled(jobs: Iterator, slots: threading.BoundedSemaphore, stop: threading.Event) -> Iterator:
+    # Pool.imap reads its input eagerly; block it once `slots` batches are in flight.
+    # It runs on the pool's feeder thread, which Pool.terminate() waits for, so it
+    # must notice `stop` when the consumer gives up instead of blocking forever.
+    for job in jobs:
+        while not slots.acquire(timeout=0.1):
+            if stop.is_set():
+                return
+        if stop.is_set():
+            return
+        yield job
+
+
+class _ZipParts:
+    """
+    Writes reports into numbered ZIP archives of at most `part_size` entries.
+    """
+
+    def __init__(self, output_path: str, part_size: int):
+        self._base, _ = os.path.splitext(output_path)
+        self._part_size = part_size
+        self._part = 0
+        self._count = 0
+        self._zip = None
+        self._names: set = set()
+        self._suffixes: Dict[str, int] = {}
+        self.paths: List[str] = []
+
+    def write(self, name: str, content: str) -> None:
+        if self._zip is None or self._count >= self._part_size:
+            self.close()
+            self._part += 1
+            path = f"{self._base}-{self._part:04d}.zip"
+            self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+            self.paths.append(path)
+            self._count = 0
+            self._names = set()
+            self._suffixes = {}
+        # Student ids come from the input file; keep entry names flat and safe
+        base = re.sub(r"[^A-Za-z0-9._-]", "_", name)
+        # Repeated ids (or ids equal after sanitising) would overwrite each other on extraction
+        entry = base
+        if entry in self._names:
+            suffix = self._suffixes.get(base, 1)
+            while entry in self._names:
+                suffix += 1
+                entry = f"{base}-{suffix}"
+            self._suffixes[base] = suffix
+        self._names.add(entry)
+        self._zip.writestr(entry + ".html", content)
+        self._count += 1
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+def generate_reports(
+    stream: Iterable[str],
+    output_path: str,
+    output_format: str = "zip",
+    model_path: str = MODEL_PATH,
+    batch_size: int = BATCH_SIZE,
+    processes: Optional[int] = None,
+    zip_part_size: int = ZIP_PART_SIZE,
+) -> Dict[str, object]:
+    """
+    Stream students from CSV text into reports.
+
+    Returns:
+        Dict[str, object]: Number of students and the files written
+
+    Raises:
+        ReportError: If any batch fails; output written so far is left in place
+    """
+    if output_format not in ("zip", "csv", "html"):
+        raise ValueError(f"Unknown report format: {output_format}")
+
+    processes = processes or os.cpu_count() or 1
+    slots = threading.BoundedSemaphore(processes * 2)
+    stop = threading.Event()
+    jobs = _throttled(
+        ((output_format, batch) for batch in read_batches(stream, batch_size)), slots, stop
+    )
+
+    students = 0
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(model_path,)) as pool:
+        try:
+            if output_format == "zip":
+                parts = _ZipParts(output_path, zip_part_size)
+                try:
+                    for count, reports in pool.imap(_process_batch, jobs):
+                        slots.release()
+                        for name, content in reports:
+                            parts.write(name, content)
+                        students += count
+                finally:
+                    parts.close()
+                return {"students": students, "files": parts.paths}
+
+            with open(output_path, "w", newline="", encoding="utf-8") as out:
+                if output_format == "csv":
+                    csv.writer(out).writerow(CSV_HEADER)
+                else:
+                    out.write(HTML_PAGE_START)
+
+                for count, chunk in pool.imap(_process_batch, jobs):
+                    slots.release()
+                    out.write(chunk)
+                    students += count
+
+                if output_format == "html":
+                    out.write(HTML_PAGE_END)
+        finally:
+            # Unblock the feeder thread before Pool.__exit__ terminates the pool
+            stop.set()
+
+    return {"students": students, "files": [output_path]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate advisor reports for many students.")
+    parser.add_argument("input", help="CSV with INFERENCE_FEATURES columns (and optional student_id), or - for stdin")
+    parser.add_argument("output", help="Output file; ZIP output is split into <name>-0001.zip, ...")
+    parser.add_argument("--format", choices=["zip", "csv", "html"], default="zip")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--zip-part-size", type=int, default=ZIP_PART_SIZE)
+    args = parser.parse_args()
+
+    try:
+        if args.input == "-":
+            summary = generate_reports(sys.stdin, args.output, args.format, args.model,
+                                       args.batch_size, args.processes, args.zip_part_size)
+        else:
+            with open(args.input, newline="", encoding="utf-8") as stream:
+                summary = generate_reports(stream, args.output, args.format, args.model,
+                                           args.batch_size, args.processes, args.zip_part_size)
+    except ReportError as e:
+        sys.exit(f"error: {e}")
+
+    print("students:", summary["students"])
+    for path in summary["files"]:
+        print("written:", path)
+
+
+if __name__ == "__main__":
+    main()
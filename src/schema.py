@@ -86,6 +86,11 @@ FEATURE_ORDER = [
     "previous_semester_gpa_scaled",
 ]
 
+# Features the model is scored on (previous semester GPA is the training target source)
+INFERENCE_FEATURES = [
+    f for f in FEATURE_ORDER if f != "previous_semester_gpa_scaled"
+]
+
 STRUCTURAL_CONTRACTS = {
     "average_attendance_per_course": {
         "type": "numeric",
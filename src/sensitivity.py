@@ -0,0 +1,185 @@
+"""
+Sensitivity analysis for the Student GPA Class Predictor.
+
+Answers "what does it take to reach the next GPA class":
+- builds a grid of perturbed feature vectors around one student, using
+  the model's split thresholds as candidate values when it exposes them
+- scores the whole grid with a single batched model call
+- finds the smallest per-feature increase that reaches the next class
+- reports which business-rule warnings that increase would clear
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from .schema import GPA_CLASS_BOUNDARY, INFERENCE_FEATURES, STRUCTURAL_CONTRACTS
+from .business_rules import check_business_rules
+from .compact import GRID_RESOLUTION, feature_grid, grid_values
+
+# Increment (in percentage points) between neighbouring grid values, used
+# when the model's split thresholds are not available
+SENSITIVITY_STEP: float = 1.0
+
+
+def split_candidates(model, resolution: float = GRID_RESOLUTION) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Percent-grid values where the model's prediction can change, per feature.
+
+    Raising one feature only changes the prediction where it crosses a split
+    threshold, so the smallest increase that reaches a class is always the
+    first grid point at or above one of them. Accepts an XGBClassifier, a
+    StandardScaler -> XGBClassifier pipeline or an InferenceExecutor.
+
+    Returns:
+        Optional[Dict[str, np.ndarray]]: Sorted candidate values per feature,
+        or None if the model's trees cannot be read
+    """
+    model = getattr(model, "model", model)
+    scaler = None
+    if hasattr(model, "steps"):
+        preprocessing = [step for _, step in model.steps[:-1]]
+        if len(preprocessing) > 1 or not all(isinstance(step, StandardScaler) for step in preprocessing):
+            return None
+        scaler = preprocessing[0] if preprocessing else None
+        model = model.steps[-1][1]
+    if not hasattr(model, "get_booster"):
+        return None
+
+    try:
+        learner = json.loads(model.get_booster().save_raw("json"))["learner"]
+        trees = learner["gradient_booster"]["model"]["trees"]
+    except KeyError:
+        return None
+
+    thresholds: Dict[int, List[float]] = {i: [] for i in range(len(INFERENCE_FEATURES))}
+    for tree in trees:
+        if any(tree["split_type"]):
+            return None
+        for left, feature, threshold in zip(
+            tree["left_children"], tree["split_indices"], tree["split_conditions"]
+        ):
+            if left != -1:
+                thresholds[feature].append(threshold)
+
+    candidates = {}
+    for i, name in enumerate(INFERENCE_FEATURES):
+        mean = float(scaler.mean_[i]) if scaler is not None and scaler.with_mean else 0.0
+        scale = float(scaler.scale_[i]) if scaler is not None and scaler.with_std else 1.0
+        grid = feature_grid(name, resolution, mean, scale)
+        # First grid point each split sends right
+        indices = np.unique(np.searchsorted(grid, np.asarray(thresholds[i], dtype=np.float32), side="left"))
+        candidates[name] = grid_values(name, resolution)[indices[indices < len(grid)]]
+    return candidates
+
+
+def _feature_grid(
+    features: Dict[str, float],
+    step: float,
+    candidates: Optional[Dict[str, np.ndarray]] = None,
+) -> Tuple[np.ndarray, List[slice]]:
+    """
+    Build the perturbation grid.
+
+    Row 0 is the unmodified student. Each feature then gets a block of rows
+    where only that feature is raised: to every candidate value above the
+    current one when `candidates` is given, otherwise in `step` increments
+    up to its maximum.
+    """
+    base = np.array([float(features[f]) for f in INFERENCE_FEATURES], dtype=np.float64)
+
+    blocks = [base[np.newaxis, :]]
+    spans: List[slice] = []
+    start = 1
+
+    for col, feature_name in enumerate(INFERENCE_FEATURES):
+        if candidates is not None:
+            values = candidates[feature_name][candidates[feature_name] > base[col]]
+        else:
+            max_val = STRUCTURAL_CONTRACTS[feature_name]["max"]
+            values = np.arange(base[col] + step, max_val, step)
+            if base[col] < max_val:
+                values = np.append(values, max_val)
+
+        block = np.repeat(base[np.newaxis, :], len(values), axis=0)
+        block[:, col] = values
+        blocks.append(block)
+
+        spans.append(slice(start, start + len(values)))
+        start += len(values)
+
+    return np.vstack(blocks), spans
+
+
+def next_class_requirements(
+    model,
+    features: Dict[str, float],
+    step: float = SENSITIVITY_STEP,
+    candidates: Optional[Dict[str, np.ndarray]] = None,
+) -> Dict[str, object]:
+    """
+    Compute the smallest single-feature increase that moves a student up one GPA class.
+
+    Args:
+        model: Classifier or InferenceExecutor exposing `predict` on INFERENCE_FEATURES rows
+        features (Dict[str, float]): Features that already passed business rules
+        step (float): Grid increment in percentage points, used without candidates
+        candidates (Optional[Dict[str, np.ndarray]]): split_candidates(model); the
+            requirements are then exact on the GRID_RESOLUTION grid
+
+    Returns:
+        Dict[str, object]: Current class, target class and per-feature requirements.
+        A requirement is None when raising that feature alone cannot reach the target.
+    """
+    grid, spans = _feature_grid(features, step, candidates)
+
+    # One batched call for the student and every perturbation
+    predictions = np.asarray(
+        model.predict(pd.DataFrame(grid, columns=INFERENCE_FEATURES))
+    ).astype(int)
+
+    current_index = int(predictions[0])
+
+    # Class 0 is the best class, so moving up means a lower index
+    if current_index == 0:
+        return {
+            "class_index": current_index,
+            "target_class_index": None,
+            "target_class": None,
+            "requirements": {},
+        }
+
+    target_index = current_index - 1
+    current_warnings = check_business_rules(features)["warnings"]
+
+    requirements: Dict[str, Optional[Dict[str, object]]] = {}
+    for col, (feature_name, span) in enumerate(zip(INFERENCE_FEATURES, spans)):
+        reached = np.flatnonzero(predictions[span] <= target_index)
+        if reached.size == 0:
+            requirements[feature_name] = None
+            continue
+
+        required_value = float(grid[span.start + reached[0], col])
+        current_value = float(features[feature_name])
+
+        perturbed = dict(features)
+        perturbed[feature_name] = required_value
+        remaining_warnings = check_business_rules(perturbed)["warnings"]
+
+        requirements[feature_name] = {
+            "current": current_value,
+            "required": round(required_value, 4),
+            "increase": round(required_value - current_value, 4),
+            "warnings_cleared": [
+                w for w in current_warnings if w not in remaining_warnings
+            ],
+        }
+
+    return {
+        "class_index": current_index,
+        "target_class_index": target_index,
+        "target_class": GPA_CLASS_BOUNDARY[target_index]["name"],
+        "requirements": requirements,
+    }
@@ -0,0 +1,289 @@
+"""
+Static frontend assets for the Student GPA Class Predictor.
+
+Responsibilities:
+- Build step: fingerprint style.css/script.js by content hash, rewrite
+  index.html to reference them, and precompress everything with gzip and
+  (when the brotli package is installed) brotli into frontend/dist
+- Serving: hold the built variants in memory, pick an encoding from
+  Accept-Encoding, and answer with ETag/Cache-Control headers or a 304
+  without touching the filesystem
+- Ignore a build whose recorded source hashes no longer match frontend/,
+  so a stale dist is never served
+
+The build is an explicit deploy step; nothing runs it at server start:
+    python -m src.static_assets
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional, .br variants are skipped without it
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONTEND_DIR = os.path.join(BASE_DIR, "frontend")
+DIST_DIR = os.path.join(FRONTEND_DIR, "dist")
+MANIFEST_NAME = "manifest.json"
+
+# URL prefix of fingerprinted files
+ASSETS_URL_PREFIX = "/assets/"
+
+# Files renamed to <stem>.<hash><ext> and cached forever
+FINGERPRINTED = ("style.css", "script.js")
+ENTRY_PAGE = "index.html"
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+}
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# The entry page keeps its URL, so browsers must revalidate it (cheap 304s)
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Preferred first; "identity" is always available
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _write_variants(dist_dir: str, filename: str, data: bytes) -> List[str]:
+    """
+    Write a file plus its compressed variants; returns encodings written.
+    """
+    with open(os.path.join(dist_dir, filename), "wb") as f:
+        f.write(data)
+
+    compressed = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed["br"] = brotli.compress(data, quality=11)
+
+    written = []
+    for encoding, suffix in ENCODINGS:
+        body = compressed.get(encoding)
+        # Not worth serving a variant that is not smaller
+        if body is None or len(body) >= len(data):
+            continue
+        with open(os.path.join(dist_dir, filename + suffix), "wb") as f:
+            f.write(body)
+        written.append(encoding)
+    return written
+
+
+def source_hashes(frontend_dir: str = FRONTEND_DIR) -> Dict[str, str]:
+    """
+    Full SHA-256 of every source file the build reads.
+    """
+    hashes = {}
+    for name in FINGERPRINTED + (ENTRY_PAGE,):
+        with open(os.path.join(frontend_dir, name), "rb") as f:
+            hashes[name] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+
+def build(frontend_dir: str = FRONTEND_DIR, dist_dir: str = DIST_DIR) -> Dict[str, Dict[str, object]]:
+    """
+    Build fingerprinted, precompressed assets and their manifest.
+
+    The manifest also records the source hashes the build was made from.
+
+    Returns:
+        Dict[str, Dict[str, object]]: Assets keyed by URL path
+    """
+    sources = source_hashes(frontend_dir)
+
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+    os.makedirs(dist_dir)
+
+    manifest: Dict[str, Dict[str, object]] = {}
+    hashed_names: Dict[str, str] = {}
+
+    for name in FINGERPRINTED:
+        with open(os.path.join(frontend_dir, name), "rb") as f:
+            data = f.read()
+        digest = _digest(data)
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{digest}{ext}"
+        hashed_names[name] = hashed
+
+        manifest[ASSETS_URL_PREFIX + hashed] = {
+            "file": hashed,
+            "etag": digest,
+            "content_type": CONTENT_TYPES[ext],
+            "immutable": True,
+            "encodings": _write_variants(dist_dir, hashed, data),
+        }
+
+    with open(os.path.join(frontend_dir, ENTRY_PAGE), encoding="utf-8") as f:
+        page = f.read()
+    for name, hashed in hashed_names.items():
+        page = re.sub(
+            rf'(\b(?:href|src)=")(?:\./)?{re.escape(name)}"',
+            rf'\g<1>{ASSETS_URL_PREFIX.lstrip("/")}{hashed}"',
+            page,
+        )
+    data = page.encode("utf-8")
+
+    manifest["/"] = {
+        "file": ENTRY_PAGE,
+        "etag": _digest(data),
+        "content_type": CONTENT_TYPES[".html"],
+        "immutable": False,
+        "encodings": _write_variants(dist_dir, ENTRY_PAGE, data),
+    }
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), "w") as f:
+        json.dump({"sources": sources, "assets": manifest}, f, indent=2)
+
+    return manifest
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """
+    Parse Accept-Encoding into {coding: q}.
+    """
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def _choose_encoding(accepted: Dict[str, float], available) -> Optional[str]:
+    """
+    Highest-q available coding, ties going to br, then gzip, then identity.
+
+    identity is acceptable unless given q=0 directly or through "*;q=0".
+    When the header does not mention it, it only wins if no listed coding
+    is available. Returns None when nothing available is acceptable.
+    """
+    if "identity" in accepted:
+        identity_q = accepted["identity"]
+    else:
+        # 0.001 is the smallest non-zero qvalue, so any listed coding beats it
+        identity_q = accepted.get("*", 0.001)
+
+    qualities = [(coding, accepted.get(coding, accepted.get("*", 0.0))) for coding, _ in ENCODINGS]
+    qualities.append(("identity", identity_q))
+
+    # Strictly greater, so earlier (preferred) codings win ties
+    best, best_q = None, 0.0
+    for coding, q in qualities:
+        if q > best_q and coding in available:
+            best, best_q = coding, q
+    return best
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
+
+
+class StaticAssets:
+    """
+    In-memory table of built assets with content negotiation.
+    """
+
+    def __init__(self, dist_dir: str = DIST_DIR):
+        with open(os.path.join(dist_dir, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+
+        self._assets: Dict[str, Dict[str, object]] = {}
+        for url_path, entry in manifest["assets"].items():
+            variants = {}
+            with open(os.path.join(dist_dir, entry["file"]), "rb") as f:
+                variants["identity"] = f.read()
+            for encoding, suffix in ENCODINGS:
+                if encoding in entry["encodings"]:
+                    with open(os.path.join(dist_dir, entry["file"] + suffix), "rb") as f:
+                        variants[encoding] = f.read()
+
+            self._assets[url_path] = {
+                "etag": entry["etag"],
+                "content_type": entry["content_type"],
+                "cache_control": IMMUTABLE_CACHE_CONTROL if entry["immutable"] else REVALIDATE_CACHE_CONTROL,
+                "variants": variants,
+            }
+
+    @classmethod
+    def load(cls, dist_dir: str = DIST_DIR, frontend_dir: str = FRONTEND_DIR) -> Optional["StaticAssets"]:
+        """
+        Load built assets, or None if there is no build or it is stale.
+
+        A build is stale when the frontend sources changed since it was made
+        (or it predates source hashes); callers then serve frontend/ as is.
+        """
+        manifest_path = os.path.join(dist_dir, MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path) as f:
+            recorded = json.load(f).get("sources")
+        if recorded != source_hashes(frontend_dir):
+            return None
+        return cls(dist_dir)
+
+    def response(
+        self, url_path: str, accept_encoding: str, if_none_match: str
+    ) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """
+        (status, headers, body) for a URL path, or None if it is not an asset.
+
+        The status is 406 when Accept-Encoding rules out every variant.
+        """
+        asset = self._assets.get(url_path)
+        if asset is None:
+            return None
+
+        encoding = _choose_encoding(_accepted_encodings(accept_encoding), asset["variants"])
+        if encoding is None:
+            return 406, {"Vary": "Accept-Encoding"}, b""
+
+        etag = f'"{asset["etag"]}"' if encoding == "identity" else f'"{asset["etag"]}-{encoding}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": asset["cache_control"],
+            "Vary": "Accept-Encoding",
+        }
+
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return 304, headers, b""
+
+        headers["Content-Type"] = asset["content_type"]
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return 200, headers, asset["variants"][encoding]
+
+
+def main():
+    manifest = build()
+    for url_path, entry in manifest.items():
+        print(url_path, "->", entry["file"], entry["encodings"])
+
+
+if __name__ == "__main__":
+    main()
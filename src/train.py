@@ -0,0 +1,229 @@
+"""
+Training script for the Student GPA Class Predictor.
+
+Responsibilities:
+- Build train/validation/test splits with build_dataset
+- Run the XGBoost hyperparameter search across a process pool
+- Early-stop every trial on the validation split
+- Log wall time, peak memory and serving latency per trial
+- Save the best model with its metrics, data hash and timing
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBClassifier
+
+from .dataset import build_dataset
+from .schema import INFERENCE_FEATURES
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(BASE_DIR, "models", "gpa_class_xgb_tuned.pkl")
+
+EARLY_STOPPING_ROUNDS = 20
+RANDOM_STATE = 42
+
+# Hyperparameter search space (full grid)
+PARAM_GRID = {
+    "max_depth": [2, 3, 4, 6],
+    "learning_rate": [0.05, 0.1, 0.3],
+    "n_estimators": [100, 300],
+    "subsample": [0.8, 1.0],
+    "min_child_weight": [1, 5],
+}
+
+
+def _param_combinations(grid: Dict[str, List]) -> List[Dict[str, object]]:
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def _peak_rss_mb() -> float:
+    """
+    Peak resident memory of the current process in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def data_hash(raw_df: pd.DataFrame) -> str:
+    """
+    Stable SHA-256 of the raw training data (values and column names).
+    """
+    digest = hashlib.sha256()
+    digest.update(",".join(map(str, raw_df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(raw_df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def _run_trial(params, X_train, y_train, X_val, y_val, model_path: str) -> Dict[str, object]:
+    """
+    Fit one configuration with early stopping and measure it.
+
+    Runs inside a pool worker that is recycled after every task, so the
+    reported peak memory belongs to this trial alone. The fitted model is
+    written to `model_path` and only its metrics go back to the parent.
+    """
+    start = time.perf_counter()
+
+    # Same shape as the shipped artifact: StandardScaler -> XGBClassifier.
+    # The scaler is fitted first so the validation split can be scaled for early stopping.
+    scaler = StandardScaler().fit(X_train)
+
+    xgb = XGBClassifier(
+        **params,
+        objective="multi:softprob",
+        eval_metric="mlogloss",
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        random_state=RANDOM_STATE,
+        n_jobs=1,
+    )
+    xgb.fit(
+        scaler.transform(X_train),
+        y_train,
+        eval_set=[(scaler.transform(X_val), y_val)],
+        verbose=False,
+    )
+    model = Pipeline([("scaler", scaler), ("xgb", xgb)])
+
+    fit_seconds = time.perf_counter() - start
+
+    val_pred = model.predict(X_val)
+    val_accuracy = float(np.mean(val_pred == np.asarray(y_val)))
+
+    # Single-row latency is what /predict pays per request
+    row = X_val.iloc[[0]]
+    repeats = 200
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(row)
+    latency_ms = (time.perf_counter() - t0) / repeats * 1000
+
+    joblib.dump(model, model_path)
+
+    return {
+        "params": params,
+        "best_iteration": int(xgb.best_iteration),
+        "val_accuracy": val_accuracy,
+        "fit_seconds": round(fit_seconds, 4),
+        "wall_seconds": round(time.perf_counter() - start, 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 2),
+        "predict_latency_ms": round(latency_ms, 4),
+        "model_path": model_path,
+    }
+
+
+def search(
+    raw_df: pd.DataFrame,
+    param_grid: Dict[str, List] = PARAM_GRID,
+    max_workers: Optional[int] = None,
+) -> Dict[str, object]:
+    """
+    Run the hyperparameter search and evaluate the best model on the test split.
+
+    Best is the highest validation accuracy, ties broken by lower
+    single-row predict latency.
+    """
+    search_start = time.perf_counter()
+
+    X_train, X_val, X_test, y_train, y_val, y_test = build_dataset(raw_df)
+    X_train, X_val, X_test = (
+        X[INFERENCE_FEATURES] for X in (X_train, X_val, X_test)
+    )
+
+    trials = []
+    combinations = _param_combinations(param_grid)
+
+    # Trial models stay on disk; the parent only ever loads the winner
+    with tempfile.TemporaryDirectory(prefix="gpa-train-") as model_dir, \
+            ProcessPoolExecutor(max_workers=max_workers, max_tasks_per_child=1) as pool:
+        futures = [
+            pool.submit(
+                _run_trial, params, X_train, y_train, X_val, y_val,
+                os.path.join(model_dir, f"trial-{i}.pkl"),
+            )
+            for i, params in enumerate(combinations)
+        ]
+        for i, future in enumerate(as_completed(futures), start=1):
+            trial = future.result()
+            trials.append(trial)
+            print(
+                f"[{i}/{len(combinations)}] {trial['params']} "
+                f"val_acc={trial['val_accuracy']:.4f} "
+                f"best_iter={trial['best_iteration']} "
+                f"wall={trial['wall_seconds']:.2f}s "
+                f"peak_rss={trial['peak_rss_mb']:.1f}MB "
+                f"latency={trial['predict_latency_ms']:.3f}ms"
+            )
+
+        best = min(trials, key=lambda t: (-t["val_accuracy"], t["predict_latency_ms"]))
+        model = joblib.load(best["model_path"])
+
+    test_accuracy = float(np.mean(model.predict(X_test) == np.asarray(y_test)))
+
+    return {
+        "model": model,
+        "params": best["params"],
+        "best_iteration": best["best_iteration"],
+        "val_accuracy": best["val_accuracy"],
+        "test_accuracy": test_accuracy,
+        "data_sha256": data_hash(raw_df),
+        "n_train": len(X_train),
+        "n_val": len(X_val),
+        "n_test": len(X_test),
+        "search_seconds": round(time.perf_counter() - search_start, 4),
+        "trials": [{k: v for k, v in t.items() if k != "model_path"} for t in trials],
+    }
+
+
+def save_model(result: Dict[str, object], model_path: str = MODEL_PATH) -> str:
+    """
+    Write the model artifact and a JSON metrics file next to it.
+    """
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    joblib.dump(result["model"], model_path)
+
+    metrics_path = os.path.splitext(model_path)[0] + ".metrics.json"
+    metrics = {k: v for k, v in result.items() if k != "model"}
+    with open(metrics_path, "w") as f:
+        json.dump(metrics, f, indent=2)
+
+    return metrics_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the GPA class XGBoost model.")
+    parser.add_argument("data", help="CSV file with FEATURE_ORDER columns")
+    parser.add_argument("--output", default=MODEL_PATH, help="Model artifact path")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    args = parser.parse_args()
+
+    raw_df = pd.read_csv(args.data)
+    result = search(raw_df, max_workers=args.workers)
+    metrics_path = save_model(result, args.output)
+
+    print("best_params:", result["params"])
+    print("val_accuracy:", result["val_accuracy"])
+    print("test_accuracy:", result["test_accuracy"])
+    print("model:", args.output)
+    print("metrics:", metrics_path)
+
+
+if __name__ == "__main__":
+    main()
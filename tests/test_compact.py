@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.compact import MODEL_PATH, _prune_node, compact_model, feature_grid, load_model
+from src.schema import INFERENCE_FEATURES
+
+FEATURE = INFERENCE_FEATURES[0]
+
+
+def _stump(threshold: float):
+    # Root split on feature 0 with two leaves
+    return {
+        "left_children": [1, -1, -1],
+        "right_children": [2, -1, -1],
+        "split_indices": [0, 0, 0],
+        "split_conditions": [threshold, -1.0, 1.0],
+    }
+
+
+def _evaluate(node, x: np.float32) -> float:
+    while node[0] == "split":
+        node = node[4] if x < np.float32(node[3]) else node[5]
+    return node[2]
+
+
+def _compacted_stump(threshold: float, mean: float = 0.0, scale: float = 1.0):
+    grid = feature_grid(FEATURE, mean=mean, scale=scale)
+    root = _prune_node(_stump(threshold), 0, {0: (0, len(grid))}, {0: grid})
+    return grid, root
+
+
+@pytest.mark.parametrize("threshold", [-5.0, 0.0, 0.005, 50.005, 99.995, 100.0, 100.005, 100.01, 250.0])
+def test_stump_matches_original_on_grid(threshold):
+    grid, root = _compacted_stump(threshold)
+    for x in grid:
+        expected = -1.0 if x < np.float32(threshold) else 1.0
+        assert _evaluate(root, x) == expected
+
+
+@pytest.mark.parametrize("threshold", [-5.0, 0.0])
+def test_threshold_at_or_below_min_keeps_right_leaf(threshold):
+    _, root = _compacted_stump(threshold)
+    assert root == ("leaf", 2, 1.0)
+
+
+@pytest.mark.parametrize("threshold", [100.005, 100.01, 250.0])
+def test_threshold_past_max_keeps_left_leaf(threshold):
+    _, root = _compacted_stump(threshold)
+    assert root == ("leaf", 1, -1.0)
+
+
+def test_threshold_at_max_keeps_split():
+    # x = 100 must still go right
+    _, root = _compacted_stump(100.0)
+    assert root[0] == "split" and root[3] == 100.0
+
+
+def test_thresholds_snap_to_scaled_grid():
+    mean, scale = 62.9, 21.3
+    grid = feature_grid(FEATURE, mean=mean, scale=scale)
+    lowest, highest = float(grid[0]), float(grid[-1])
+
+    for threshold in (lowest, lowest - 1.0):
+        _, root = _compacted_stump(threshold, mean, scale)
+        assert root[0] == "leaf" and root[2] == 1.0
+    _, root = _compacted_stump(highest + 1e-3, mean, scale)
+    assert root[0] == "leaf" and root[2] == -1.0
+
+    threshold = float((grid[5000] + grid[5001]) / 2)
+    _, root = _compacted_stump(threshold, mean, scale)
+    assert root[3] == float(grid[5001])
+    for x in grid:
+        assert _evaluate(root, x) == (-1.0 if x < np.float32(threshold) else 1.0)
+
+
+@pytest.mark.skipif(not os.path.exists(MODEL_PATH), reason="shipped model not available")
+def test_shipped_model_predictions_preserved_on_grid(tmp_path):
+    model = load_model(MODEL_PATH)
+    output = str(tmp_path / "compact.pkl")
+    compact_model(model, output)
+    compacted = load_model(output)
+
+    rng = np.random.default_rng(0)
+    samples = rng.integers(0, 10001, size=(5000, len(INFERENCE_FEATURES))) / 100
+    # Grid corners and edges
+    samples = np.vstack([samples, np.zeros(len(INFERENCE_FEATURES)), np.full(len(INFERENCE_FEATURES), 100.0)])
+    X = pd.DataFrame(samples, columns=INFERENCE_FEATURES)
+
+    np.testing.assert_array_equal(compacted.predict_proba(X), model.predict_proba(X))